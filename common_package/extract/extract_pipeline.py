@@ -2,6 +2,9 @@ import pandas as pd
 from pandas import DataFrame
 import logging
 from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 
 logging.basicConfig(
     level=logging.INFO,
@@ -9,26 +12,98 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column types and columns per data type, used by the CSV readers so only the needed columns are parsed, once, at load time.
+# transform_pipeline_polars derives its schema from this too, so both engines read the same columns.
+CSV_SCHEMAS = {
+    'timesheets': {
+        'dtype': {
+            'timesheet_id': 'int64',
+            'employee_id': 'int64',
+            'checkin': 'string',
+            'checkout': 'string'
+        },
+        'parse_dates': ['date']
+    },
+    'employees': {
+        'dtype': {
+            'employe_id': 'int64',
+            # Categorical so merge and groupby carry small integer codes instead of int64 keys
+            'branch_id': 'category',
+            'salary': 'int64'
+        },
+        'usecols': ['employe_id', 'branch_id', 'salary']
+    }
+}
+
+# Bytes of timesheets CSV parsed per record batch, bounds peak memory while filtering by date
+TIMESHEETS_BLOCK_SIZE = 64 << 20
+
+# Arrow types for the pandas dtypes used in CSV_SCHEMAS
+ARROW_DTYPES = {
+    'int64': pa.int64(),
+    'string': pa.string()
+}
+
+def timesheets_cutoff() -> datetime:
+    """
+    Get the timestamp timesheet records must be later than to be loaded.
+
+    Returns:
+        datetime: Timestamp 1 day before now.
+    """
+    return datetime.now() - timedelta(days=1)
+
+def _read_csv_filtered(path: str, schema: dict, after: datetime) -> DataFrame:
+    """
+    Stream a CSV file through the multithreaded pyarrow reader and keep only rows with 'date' later
+    than the given timestamp, so only one block plus the kept rows are held in memory.
+
+    Args:
+        path (str): Path to the CSV file.
+        schema (dict): Entry of CSV_SCHEMAS with 'dtype' and 'parse_dates'.
+        after (datetime): Keep rows with 'date' later than this timestamp.
+
+    Returns:
+        DataFrame: Filtered DataFrame with the column types from the schema.
+    """
+    column_types = {column: ARROW_DTYPES[dtype] for column, dtype in schema['dtype'].items()}
+    column_types.update({column: pa.timestamp('us') for column in schema['parse_dates']})
+
+    reader = pv.open_csv(
+        path,
+        read_options=pv.ReadOptions(block_size=TIMESHEETS_BLOCK_SIZE),
+        convert_options=pv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+    )
+    cutoff = pa.scalar(after, type=pa.timestamp('us'))
+    batches = [batch.filter(pc.greater(batch['date'], cutoff)) for batch in reader]
+
+    df = pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+    return df.astype(schema['dtype'])
+
 def load_csv(path: str, data_type: str) -> DataFrame:
     """
     Load a CSV file into a pandas DataFrame.
 
     Args:
         path (str): Path to the CSV file.
-        data_type (str): Type of data being loaded (for logging purposes).
+        data_type (str): Type of data being loaded ('timesheets' or 'employees'), used to pick the column types.
 
     Returns:
         DataFrame: Loaded DataFrame.
     """
     try:
-        df = pd.read_csv(path)
+        schema = CSV_SCHEMAS.get(data_type, {})
 
         # Add Filter with timestamp - 1 day before for timesheet to reduce data load
         # This is optional, if you need to reduce the data by 1 day before 
         # (Can be specified last update if there is value or get the data first from the bigquery)
         if data_type == 'timesheets':
-            one_day_before = datetime.now() - timedelta(days=1)
-            df = df[pd.to_datetime(df['date']) > (one_day_before)]
+            one_day_before = timesheets_cutoff()
+
+            df = _read_csv_filtered(path, schema, one_day_before)
+        else:
+            # Use the multithreaded pyarrow parser instead of the default single-threaded C parser
+            df = pd.read_csv(path, engine='pyarrow', **schema)
 
         logger.info(f"Loaded {data_type} data from '{path}' with {len(df)} records.")
         return df
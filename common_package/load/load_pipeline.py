@@ -1,6 +1,8 @@
 import pandas as pd
 from pandas import DataFrame
 import logging
+import uuid
+from functools import lru_cache, partial
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
@@ -11,18 +13,60 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4)
+def _get_client(project_id: str, credentials_path: str = None) -> bigquery.Client:
+    """
+    Create a BigQuery client, cached per project and credentials so repeated loads reuse it.
+
+    Args:
+        project_id (str): Google Cloud project ID.
+        credentials_path (str, optional): Path to the service account JSON key file. If not provided, default credentials are used.
+
+    Returns:
+        bigquery.Client: Authenticated BigQuery client.
+    """
+    if credentials_path:
+        credentials = service_account.Credentials.from_service_account_file(credentials_path)
+        client = bigquery.Client(credentials=credentials, project=project_id)
+        logger.info("Authenticated using provided service account credentials.")
+    else:
+        client = bigquery.Client(project=project_id)
+        logger.info("Authenticated using default credentials.")
+    return client
+
+
+def _log_merge_result(main_table_ref: str, record_count: int, merge_job: bigquery.QueryJob) -> None:
+    """
+    Log the outcome of a MERGE job submitted without waiting for it.
+
+    Args:
+        main_table_ref (str): Fully qualified main table ID.
+        record_count (int): Number of records in the staging data.
+        merge_job (bigquery.QueryJob): The finished MERGE job.
+    """
+    if merge_job.exception() is not None:
+        logger.error(f"Failed to upload data to BigQuery: {merge_job.exception()}")
+    else:
+        logger.info(f"Successfully merged {record_count} records into main table '{main_table_ref}'.")
+
+
 def load_to_bigquery(
     df: DataFrame,
     project_id: str,
     dataset_id: str,
     main_table_id: str,
     staging_table_id: str,
-    credentials_path: str = None
-) -> None:
+    credentials_path: str = None,
+    wait: bool = True
+) -> bigquery.QueryJob:
     """
-    Upload a pandas DataFrame to a BigQuery table using a staging table and delete-insert strategy
+    Upload a pandas DataFrame to a BigQuery table using a staging table and a MERGE (upsert) strategy
     based on year, month, and branch_id.
 
+    The staging table is overwritten on every call, so concurrent calls must not share the same
+    staging table, otherwise one call can overwrite the staging data before another call has merged it.
+    With wait=False a unique suffix is added to staging_table_id so concurrent calls never share it.
+
     Args:
         df (DataFrame): The DataFrame to upload.
         project_id (str): Google Cloud project ID.
@@ -30,55 +74,67 @@ def load_to_bigquery(
         main_table_id (str): BigQuery main table ID.
         staging_table_id (str): BigQuery staging table ID.
         credentials_path (str, optional): Path to the service account JSON key file. If not provided, default credentials are used.
+        wait (bool, optional): Block until the MERGE job completes. If False, return as soon as the MERGE job is
+            submitted so the caller can run other loads concurrently, each with its own staging table.
+
+    Returns:
+        bigquery.QueryJob: The MERGE job, call `result()` on it to wait for completion.
     """
     logger.info(f"Uploading data to BigQuery. Project: '{project_id}', Dataset: '{dataset_id}'.")
 
     try:
-        if credentials_path:
-            credentials = service_account.Credentials.from_service_account_file(credentials_path)
-            client = bigquery.Client(credentials=credentials, project=project_id)
-            logger.info("Authenticated using provided service account credentials.")
-        else:
-            client = bigquery.Client(project=project_id)
-            logger.info("Authenticated using default credentials.")
+        client = _get_client(project_id, credentials_path)
 
         # Define table references
         main_table_ref = f"{project_id}.{dataset_id}.{main_table_id}"
         staging_table_ref = f"{project_id}.{dataset_id}.{staging_table_id}"
+        if not wait:
+            # The MERGE script drops the staging table afterwards, so the unique table does not pile up
+            staging_table_ref = f"{staging_table_ref}_{uuid.uuid4().hex}"
 
         # Upload the DataFrame to the staging table with WRITE_TRUNCATE to overwrite existing staging data
         logger.info(f"Uploading data to staging table '{staging_table_ref}'.")
-        job = client.load_table_from_dataframe(df, staging_table_ref, job_config=bigquery.LoadJobConfig(write_disposition="WRITE_TRUNCATE"))
+        job_config = bigquery.LoadJobConfig(
+            write_disposition="WRITE_TRUNCATE",
+            source_format=bigquery.SourceFormat.PARQUET
+        )
+        job = client.load_table_from_dataframe(df, staging_table_ref, job_config=job_config)
         job.result()  # Wait for the upload to complete
         logger.info(f"Successfully uploaded data to staging table '{staging_table_ref}'.")
 
-        # Delete existing records in the main table that match year, month, branch_id in the staging table
-        delete_query = f"""
-        DELETE FROM `{main_table_ref}` AS main
-        WHERE EXISTS (
-            SELECT 1
-            FROM `{staging_table_ref}` AS staging
-            WHERE main.year = staging.year
-            AND main.month = staging.month
-            AND main.branch_id = staging.branch_id
-        );
-
-        INSERT INTO `{main_table_ref}` (year, month, branch_id, hours_diff, salary, salary_per_hour)
-        SELECT year, month, branch_id, hours_diff, salary, salary_per_hour
-        FROM `{staging_table_ref}`;
+        # Upsert the staging records into the main table on year, month, branch_id in a single job.
+        # The same script drops the staging table afterwards, avoiding a separate delete_table API call.
+        merge_query = f"""
+        MERGE `{main_table_ref}` AS main
+        USING `{staging_table_ref}` AS staging
+        ON main.year = staging.year
+        AND main.month = staging.month
+        AND main.branch_id = staging.branch_id
+        WHEN MATCHED THEN
+            UPDATE SET
+                hours_diff = staging.hours_diff,
+                salary = staging.salary,
+                salary_per_hour = staging.salary_per_hour
+        WHEN NOT MATCHED THEN
+            INSERT (year, month, branch_id, hours_diff, salary, salary_per_hour)
+            VALUES (staging.year, staging.month, staging.branch_id, staging.hours_diff, staging.salary, staging.salary_per_hour);
+
+        DROP TABLE IF EXISTS `{staging_table_ref}`;
         """
 
-        logger.info("Executing DELETE INSERT statement to remove existing records matching the staging data keys.")
-        delete_job = client.query(delete_query)
-        delete_job.result()  # Wait for the DELETE job to complete
-        logger.info("DELETE INSERT statement executed successfully.")
+        logger.info("Executing MERGE statement to upsert the staging data into the main table.")
+        merge_job = client.query(merge_query)
+
+        if not wait:
+            merge_job.add_done_callback(partial(_log_merge_result, main_table_ref, len(df)))
+            logger.info(f"Submitted MERGE job '{merge_job.job_id}' for main table '{main_table_ref}'.")
+            return merge_job
 
-        logger.info(f"Successfully delete inserted {len(df)} records into main table '{main_table_ref}'.")
+        merge_job.result()  # Wait for the MERGE job to complete
+        logger.info("MERGE statement executed successfully.")
 
-        # Clean up the staging table if not needed
-        logger.info(f"Deleting staging table '{staging_table_ref}'.")
-        client.delete_table(staging_table_ref)
-        logger.info(f"Staging table '{staging_table_ref}' deleted successfully.")
+        logger.info(f"Successfully merged {len(df)} records into main table '{main_table_ref}'.")
+        return merge_job
 
     except Exception as e:
         logger.error(f"Failed to upload data to BigQuery: {e}")
@@ -1,7 +1,6 @@
 import pandas as pd
 from pandas import DataFrame
 import logging
-from typing import List, Tuple
 import numpy as np
 
 logging.basicConfig(
@@ -21,71 +20,32 @@ def remove_duplicates(timesheets: DataFrame) -> DataFrame:
         DataFrame: Cleaned DataFrame with duplicate records removed.
     """
     logger.info("Removing duplicate timesheet records.")
-    duplicates = timesheets[timesheets.duplicated(subset=['employee_id', 'date'], keep=False)]
-    index_to_delete = []
-
-    for _, row in duplicates.iterrows():
-        # Find duplicates for the current employee_id and date
-        mask = (
-            (timesheets['employee_id'] == row['employee_id']) &
-            (timesheets['date'] == row['date'])
-        )
-        duplicate_subset = timesheets[mask]
-
-        # Remove timesheets with null checkout first
-        null_checkout = duplicate_subset[duplicate_subset['checkout'].isna()]
-        if not null_checkout.empty:
-            index_to_delete.append(null_checkout.index[0])
-            logger.info(f"Marked index {null_checkout.index[0]} for deletion due to null checkout.")
-            continue
-
-        # Remove duplicated rows except the first occurrence based on all columns except timesheet_id
-        duplicated_except_id = duplicate_subset.drop(['timesheet_id'], axis=1).duplicated(keep='first')
-        duplicate_indices = duplicate_subset[duplicated_except_id].index
-        if not duplicate_indices.empty:
-            index_to_delete.append(duplicate_indices[0])
-            logger.info(f"Marked index {duplicate_indices[0]} for deletion due to duplication.")
-
-    cleaned_timesheets = timesheets.drop(index=index_to_delete)
-    logger.info(f"Removed {len(index_to_delete)} duplicate timesheet records.")
-    return cleaned_timesheets
-
-
-def process_timesheets_column(
-    timesheets: DataFrame,
-    column_name: str,
-    condition_choices: List[Tuple[List[pd.Series], List[pd.Timedelta]]]
-) -> DataFrame:
-    """
-    Processes a specified timesheet column by converting it to timedelta and filling missing values
-    based on conditions and choices.
-
-    Args:
-        timesheets (DataFrame): The DataFrame containing timesheet data.
-        column_name (str): The name of the column to process ('checkin' or 'checkout').
-        condition_choices (List[Tuple[List[pd.Series], List[pd.Timedelta]]]): 
-            A list of tuples where each tuple contains a list of conditions and a list of choices for filling missing values.
-
-    Returns:
-        DataFrame: The updated DataFrame with processed column.
-    """
-    logger.info(f"Processing column '{column_name}'.")
-    
-    # Convert the column to string to handle any direct numeric values
-    timesheets[column_name] = timesheets[column_name].astype(str)
-
-    # Iterate over each set of conditions and choices to fill missing values
-    for conditions, choices in condition_choices:
-        timesheets[column_name] = np.select(conditions, choices, default=timesheets[column_name])
-
-    # Convert the column to timedelta
-    timesheets[column_name] = pd.to_timedelta(timesheets[column_name], errors='coerce')
 
-    missing_after = timesheets[column_name].isna().sum()
-    if missing_after > 0:
-        logger.info(f"Column '{column_name}' has {missing_after} missing values after processing.")
-
-    return timesheets
+    # Number each employee_id and date group once, the masks below work on these integer codes
+    key_columns = ['employee_id', 'date']
+    codes = timesheets.groupby(key_columns, sort=False, dropna=False).ngroup().to_numpy()
+    has_duplicates = np.bincount(codes)[codes] > 1
+    null_checkout = timesheets['checkout'].isna().to_numpy()
+
+    # Remove timesheets with null checkout first, the first one of each duplicated employee_id and date
+    null_candidates = has_duplicates & null_checkout
+    drop_null = np.zeros(len(timesheets), dtype=bool)
+    drop_null[null_candidates] = ~pd.Series(codes[null_candidates]).duplicated().to_numpy()
+
+    # Otherwise remove the first row that duplicates an earlier one on all columns except timesheet_id
+    group_has_null = np.bincount(codes, weights=null_checkout)[codes] > 0
+    # Hash the columns in place via subset, so the only full-frame copy is the final selection
+    columns_except_id = [column for column in timesheets.columns if column != 'timesheet_id']
+    duplicated_except_id = timesheets.duplicated(subset=columns_except_id, keep='first').to_numpy()
+    duplicate_candidates = has_duplicates & ~group_has_null & duplicated_except_id
+    drop_duplicate = np.zeros(len(timesheets), dtype=bool)
+    drop_duplicate[duplicate_candidates] = ~pd.Series(codes[duplicate_candidates]).duplicated().to_numpy()
+
+    # Same-day records that differ in checkin or checkout are kept, the frame is gathered once
+    cleaned_timesheets = timesheets[~(drop_null | drop_duplicate)]
+
+    logger.info(f"Removed {len(timesheets) - len(cleaned_timesheets)} duplicate timesheet records.")
+    return cleaned_timesheets
 
 
 def transform_times(timesheets: DataFrame) -> DataFrame:
@@ -100,39 +60,27 @@ def transform_times(timesheets: DataFrame) -> DataFrame:
     """
     logger.info("Transforming 'checkin' and 'checkout' columns.")
 
-    # Define conditions and choices for 'checkout'
-    checkout_condition_choices = [
-        (
-            [
-                timesheets['checkout'].isna() & (pd.to_timedelta(timesheets['checkin']) <= pd.Timedelta('0 days 12:00:00')),
-                timesheets['checkout'].isna() & (pd.to_timedelta(timesheets['checkin']) > pd.Timedelta('0 days 12:00:00'))
-            ],
-            [
-                pd.Timedelta('0 days 18:00:00'),
-                pd.Timedelta('1 days 08:00:00')
-            ]
-        )
-    ]
-
-    # Process 'checkout' column
-    timesheets = process_timesheets_column(timesheets, 'checkout', checkout_condition_choices)
-
-    # Define conditions and choices for 'checkin'
-    checkin_condition_choices = [
-        (
-            [
-                timesheets['checkin'].isna() & (pd.to_timedelta(timesheets['checkout']) <= pd.Timedelta('0 days 09:00:00')),
-                timesheets['checkin'].isna() & (pd.to_timedelta(timesheets['checkout']) > pd.Timedelta('0 days 09:00:00'))
-            ],
-            [
-                pd.Timedelta('0 days 00:00:00'),
-                pd.Timedelta('0 days 09:00:00')
-            ]
-        )
-    ]
-
-    # Process 'checkin' column
-    timesheets = process_timesheets_column(timesheets, 'checkin', checkin_condition_choices)
+    # Parse both columns once, unparseable values become NaT
+    checkin = pd.to_timedelta(timesheets['checkin'], errors='coerce')
+    checkout = pd.to_timedelta(timesheets['checkout'], errors='coerce')
+
+    # Fill missing 'checkout' based on 'checkin'
+    missing_checkout = checkout.isna()
+    checkout = checkout.mask(missing_checkout & (checkin <= pd.Timedelta('0 days 12:00:00')), pd.Timedelta('0 days 18:00:00'))
+    checkout = checkout.mask(missing_checkout & (checkin > pd.Timedelta('0 days 12:00:00')), pd.Timedelta('1 days 08:00:00'))
+
+    # Fill missing 'checkin' based on the filled 'checkout'
+    missing_checkin = checkin.isna()
+    checkin = checkin.mask(missing_checkin & (checkout <= pd.Timedelta('0 days 09:00:00')), pd.Timedelta('0 days 00:00:00'))
+    checkin = checkin.mask(missing_checkin & (checkout > pd.Timedelta('0 days 09:00:00')), pd.Timedelta('0 days 09:00:00'))
+
+    timesheets['checkin'] = checkin
+    timesheets['checkout'] = checkout
+
+    for column_name in ['checkout', 'checkin']:
+        missing_after = timesheets[column_name].isna().sum()
+        if missing_after > 0:
+            logger.info(f"Column '{column_name}' has {missing_after} missing values after processing.")
 
     logger.info("Completed transforming 'checkin' and 'checkout' columns.")
     return timesheets
@@ -150,21 +98,24 @@ def adjust_checkout_times(timesheets: DataFrame) -> DataFrame:
     """
     logger.info("Adjusting checkout times where checkin is later than checkout.")
     
+    checkin = timesheets['checkin'].to_numpy()
+    checkout = timesheets['checkout'].to_numpy()
+
     # Identify records where checkin > checkout
-    mask = timesheets['checkin'] > timesheets['checkout']
+    mask = checkin > checkout
     adjustment_count = mask.sum()
 
     if adjustment_count > 0:
         # Adjust checkout by adding one day where necessary
-        timesheets.loc[mask, 'checkout'] += pd.Timedelta(days=1)
+        checkout = np.where(mask, checkout + np.timedelta64(1, 'D'), checkout)
+        timesheets['checkout'] = checkout
         logger.info(f"Adjusted checkout times for {adjustment_count} records where checkin > checkout.")
     else:
         logger.info("No checkout times needed adjustment.")
 
-    # Calculate time differences
-    timesheets['time_diff'] = timesheets['checkout'] - timesheets['checkin']
-    timesheets['hours_diff'] = timesheets['time_diff'].dt.total_seconds() / 3600
-    logger.info("Calculated 'time_diff' and 'hours_diff'.")
+    # Calculate time differences in hours directly on the arrays, missing times give NaN
+    timesheets['hours_diff'] = (checkout - checkin) / np.timedelta64(1, 'h')
+    logger.info("Calculated 'hours_diff'.")
 
     return timesheets
 
@@ -182,17 +133,18 @@ def merge_employees_timesheets(timesheets: DataFrame, employees: DataFrame) -> D
     """
     logger.info("Merging timesheets with employees data.")
     
-    # Rename column for consistency
-    employees_renamed = employees.rename(columns={'employe_id': 'employee_id'})
+    # Rename column for consistency and index the small employees table by its key
+    employees_renamed = employees.rename(columns={'employe_id': 'employee_id'}).set_index('employee_id')
     logger.info("Renamed 'employe_id' to 'employee_id' in employees DataFrame.")
 
-    # Perform the merge
-    merged_data = pd.merge(timesheets, employees_renamed, on='employee_id', how='left')
+    # Perform the join as an index lookup into employees
+    merged_data = timesheets.join(employees_renamed, on='employee_id', how='left', sort=False)
     logger.info(f"Merged data contains {len(merged_data)} records.")
 
     # Extract year and month from date
-    merged_data['year'] = pd.to_datetime(merged_data['date']).dt.year
-    merged_data['month'] = pd.to_datetime(merged_data['date']).dt.month
+    dates = pd.to_datetime(merged_data['date'])
+    merged_data['year'] = dates.dt.year
+    merged_data['month'] = dates.dt.month
     logger.info("Extracted 'year' and 'month' from 'date'.")
 
     return merged_data
@@ -210,22 +162,32 @@ def aggregate_data(merged_data: DataFrame) -> DataFrame:
     """
     logger.info("Aggregating data by year, month, and branch.")
 
-    # Select relevant columns for aggregation
-    aggregated = merged_data.groupby(['year', 'month', 'branch_id', 'salary'], as_index=False).agg({
-        'hours_diff': 'sum'
-    })
-
-    # Further aggregate by year, month, and branch
-    final_aggregated = aggregated.groupby(['year', 'month', 'branch_id'], as_index=False).agg({
-        'hours_diff': 'sum',
-        'salary': 'sum'
-    })
-
-    # Calculate salary per hour
-    final_aggregated['salary_per_hour'] = final_aggregated.apply(
-        lambda row: row['salary'] / row['hours_diff'] if row['hours_diff'] != 0 else 0,
-        axis=1
+    # Count each distinct salary once per year, month, and branch
+    first_salary_record = ~merged_data.duplicated(subset=['year', 'month', 'branch_id', 'salary'])
+
+    # Aggregate hours and salary by year, month, and branch in a single pass
+    final_aggregated = (
+        merged_data
+        .assign(salary=merged_data['salary'].where(first_salary_record, 0))
+        .groupby(['year', 'month', 'branch_id'], sort=False, observed=True, as_index=False)
+        .agg({
+            'hours_diff': 'sum',
+            'salary': 'sum'
+        })
+    )
+
+    # Store branch_id as a plain integer again for the upload
+    final_aggregated['branch_id'] = final_aggregated['branch_id'].astype('int64')
+
+    # Calculate salary per hour, groups without any hours get 0
+    hours = final_aggregated['hours_diff'].to_numpy(dtype='float64')
+    salary = final_aggregated['salary'].to_numpy(dtype='float64')
+    final_aggregated['salary_per_hour'] = np.divide(
+        salary, hours, out=np.zeros_like(salary), where=hours != 0
     )
 
+    # Down-cast the key columns to shrink the upload, amounts stay 64-bit to keep their precision
+    final_aggregated = final_aggregated.astype({'year': 'int16', 'month': 'int8'})
+
     logger.info("Aggregated data and calculated 'salary_per_hour'.")
     return final_aggregated
\ No newline at end of file
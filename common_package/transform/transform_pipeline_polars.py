@@ -0,0 +1,174 @@
+import polars as pl
+from pandas import DataFrame
+import logging
+
+from common_package.extract.extract_pipeline import CSV_SCHEMAS, timesheets_cutoff
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Time of day values in nanoseconds, the unit used for the parsed checkin and checkout columns
+HOUR_NS = 3600 * 10**9
+DAY_NS = 24 * HOUR_NS
+
+# Polars types for the pandas dtypes used in CSV_SCHEMAS, categories are a pandas-only memory
+# optimisation for integer keys so Polars reads the plain integers
+POLARS_DTYPES = {
+    'int64': pl.Int64,
+    'string': pl.String,
+    'category': pl.Int64
+}
+
+
+def _parse_time(column_name: str) -> pl.Expr:
+    """
+    Parse an 'H:MM:SS' time column, with optional fractional seconds and hours past 24, to nanoseconds.
+    Values in any other format become null.
+
+    Args:
+        column_name (str): The name of the column to parse ('checkin' or 'checkout').
+
+    Returns:
+        pl.Expr: Nanoseconds since midnight as Int64.
+    """
+    column = pl.col(column_name).str.strip_chars()
+    pattern = r'^(\d+):(\d{1,2}):(\d{1,2}(?:\.\d+)?)$'
+    hours = column.str.extract(pattern, 1).cast(pl.Int64)
+    minutes = column.str.extract(pattern, 2).cast(pl.Int64)
+    seconds = column.str.extract(pattern, 3).cast(pl.Float64)
+    return (hours * HOUR_NS + minutes * 60 * 10**9 + (seconds * 10**9).round().cast(pl.Int64)).alias(column_name)
+
+
+def _schema_overrides(data_type: str) -> dict:
+    """
+    Build Polars column types from the pandas schema in CSV_SCHEMAS.
+
+    Args:
+        data_type (str): Type of data being loaded ('timesheets' or 'employees').
+
+    Returns:
+        dict: Column name to Polars type mapping.
+    """
+    schema = CSV_SCHEMAS[data_type]
+    overrides = {column: POLARS_DTYPES[dtype] for column, dtype in schema['dtype'].items()}
+    overrides.update({column: pl.Date for column in schema.get('parse_dates', [])})
+    return overrides
+
+
+def scan_timesheets(path: str) -> pl.LazyFrame:
+    """
+    Lazily scan the timesheets CSV file, keeping only records later than `timesheets_cutoff`,
+    the same filter `load_csv` applies.
+
+    Args:
+        path (str): Path to the timesheets CSV file.
+
+    Returns:
+        pl.LazyFrame: Lazy timesheets.
+    """
+    return (
+        pl.scan_csv(path, schema_overrides=_schema_overrides('timesheets'))
+        .filter(pl.col('date').cast(pl.Datetime) > timesheets_cutoff())
+    )
+
+
+def scan_employees(path: str) -> pl.LazyFrame:
+    """
+    Lazily scan the employees CSV file.
+
+    Args:
+        path (str): Path to the employees CSV file.
+
+    Returns:
+        pl.LazyFrame: Lazy employees with 'employe_id' renamed to 'employee_id'.
+    """
+    return (
+        pl.scan_csv(path, schema_overrides=_schema_overrides('employees'))
+        .select(CSV_SCHEMAS['employees']['usecols'])
+        .rename({'employe_id': 'employee_id'})
+    )
+
+
+def transform_branch_salary(timesheets: pl.LazyFrame, employees: pl.LazyFrame) -> DataFrame:
+    """
+    Run the whole transform stage as a single Polars query: remove duplicates, fill missing checkin
+    and checkout times, adjust overnight checkouts, join employees and aggregate by year, month, and branch.
+    Produces the same result as the pandas functions in `transform_pipeline` for checkin and checkout
+    values in 'H:MM:SS' form (fractional seconds and hours past 24 allowed). Other formats that pandas
+    `to_timedelta` accepts, such as '1 days 02:00:00', are treated as missing here.
+
+    Args:
+        timesheets (pl.LazyFrame): Timesheets from `scan_timesheets`.
+        employees (pl.LazyFrame): Employees from `scan_employees`.
+
+    Returns:
+        DataFrame: Aggregated pandas DataFrame with total hours and salary per hour, ready for upload.
+    """
+    logger.info("Running transform stage with Polars.")
+
+    checkin = pl.col('checkin')
+    checkout = pl.col('checkout')
+
+    key_columns = ['employee_id', 'date']
+    has_duplicates = pl.len().over(key_columns) > 1
+    null_checkout = checkout.is_null()
+    drop_null_checkout = has_duplicates & null_checkout & (null_checkout.cum_sum().over(key_columns) == 1)
+    duplicated_except_id = ~pl.struct(pl.all().exclude('timesheet_id')).is_first_distinct()
+    drop_duplicate = (
+        has_duplicates
+        & ~null_checkout.any().over(key_columns)
+        & duplicated_except_id
+        & (duplicated_except_id.cum_sum().over(key_columns) == 1)
+    )
+
+    query = (
+        timesheets
+        # Same rules as remove_duplicates: in each duplicated employee_id and date, drop the first record
+        # with a null checkout, or if there is none, the first record duplicating an earlier one except timesheet_id
+        .filter(~(drop_null_checkout | drop_duplicate))
+        # Parse checkin and checkout to nanoseconds since midnight
+        .with_columns(_parse_time('checkin'), _parse_time('checkout'))
+        # Fill missing 'checkout' based on 'checkin', then missing 'checkin' based on the filled 'checkout'
+        .with_columns(
+            pl.when(checkout.is_null() & (checkin <= 12 * HOUR_NS)).then(18 * HOUR_NS)
+            .when(checkout.is_null() & (checkin > 12 * HOUR_NS)).then(DAY_NS + 8 * HOUR_NS)
+            .otherwise(checkout)
+            .alias('checkout')
+        )
+        .with_columns(
+            pl.when(checkin.is_null() & (checkout <= 9 * HOUR_NS)).then(0)
+            .when(checkin.is_null() & (checkout > 9 * HOUR_NS)).then(9 * HOUR_NS)
+            .otherwise(checkin)
+            .alias('checkin')
+        )
+        # Adjust checkout by adding one day where checkin > checkout
+        .with_columns(
+            pl.when(checkin > checkout).then(checkout + DAY_NS).otherwise(checkout).alias('checkout')
+        )
+        .with_columns(
+            ((checkout - checkin) / HOUR_NS).alias('hours_diff'),
+            pl.col('date').dt.year().cast(pl.Int16).alias('year'),
+            pl.col('date').dt.month().cast(pl.Int8).alias('month')
+        )
+        .join(employees, on='employee_id', how='left')
+        .filter(pl.col('branch_id').is_not_null())
+        # Count each distinct salary once per year, month, and branch
+        .group_by(['year', 'month', 'branch_id'])
+        .agg(
+            pl.col('hours_diff').sum(),
+            pl.col('salary').unique().sum()
+        )
+        .with_columns(
+            pl.when(pl.col('hours_diff') != 0)
+            .then(pl.col('salary') / pl.col('hours_diff'))
+            .otherwise(0.0)
+            .alias('salary_per_hour')
+        )
+    )
+
+    final_aggregated = query.collect(engine='streaming').to_pandas()
+    logger.info(f"Aggregated data contains {len(final_aggregated)} records.")
+    return final_aggregated
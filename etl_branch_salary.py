@@ -2,6 +2,7 @@ import logging
 import pandas as pd
 from dotenv import load_dotenv
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from common_package.extract.extract_pipeline import load_csv
 from common_package.transform.transform_pipeline import remove_duplicates, transform_times, adjust_checkout_times, merge_employees_timesheets, aggregate_data
@@ -24,27 +25,45 @@ logger = logging.getLogger(__name__)
 
 def etl(BIGQUERY_DATASET_ID : str,
         BIGQUERY_MAIN_TABLE_ID : str,
-        BIGQUERY_STAGING_TABLE_ID : str
+        BIGQUERY_STAGING_TABLE_ID : str,
+        TRANSFORM_ENGINE : str = 'pandas'
         ) -> None:
-    """Main function to execute the data pipeline steps."""
+    """Main function to execute the data pipeline steps.
+
+    TRANSFORM_ENGINE selects the transform stage: 'pandas' (default) or 'polars',
+    which runs extraction and transformation as a single multithreaded Polars query.
+    """
+    if TRANSFORM_ENGINE not in ('pandas', 'polars'):
+        raise ValueError(f"Unknown TRANSFORM_ENGINE '{TRANSFORM_ENGINE}', expected 'pandas' or 'polars'.")
+
     try:
         load_dotenv()
         logger.info("Starting data processing pipeline.")
 
-        # Load data        
-        employees = load_csv('employees.csv', "employees")
-        timesheets = load_csv('timesheets.csv', "timesheets")
-
-
-        # Data cleaning and transformation
-        timesheets = remove_duplicates(timesheets)
-        timesheets = transform_times(timesheets)
-        timesheets = adjust_checkout_times(timesheets)
-
-        # Merge and aggregate data
-        final_data = merge_employees_timesheets(timesheets, employees)
-        final_data = aggregate_data(final_data)
-        logger.info("Completed merging and aggregation.")
+        if TRANSFORM_ENGINE == 'polars':
+            # Imported here so polars is only required when this engine is selected
+            from common_package.transform.transform_pipeline_polars import scan_timesheets, scan_employees, transform_branch_salary
+
+            final_data = transform_branch_salary(scan_timesheets('timesheets.csv'), scan_employees('employees.csv'))
+            logger.info("Completed merging and aggregation.")
+        else:
+            # Load data, both files are independent so read them concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                employees_future = executor.submit(load_csv, 'employees.csv', "employees")
+                timesheets_future = executor.submit(load_csv, 'timesheets.csv', "timesheets")
+                employees = employees_future.result()
+                timesheets = timesheets_future.result()
+
+
+            # Data cleaning and transformation
+            timesheets = remove_duplicates(timesheets)
+            timesheets = transform_times(timesheets)
+            timesheets = adjust_checkout_times(timesheets)
+
+            # Merge and aggregate data
+            final_data = merge_employees_timesheets(timesheets, employees)
+            final_data = aggregate_data(final_data)
+            logger.info("Completed merging and aggregation.")
 
         # Upload final data to BigQuery
         # Replace the following variables with your actual BigQuery configuration